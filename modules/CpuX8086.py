@@ -2,12 +2,13 @@ from typing import (
     List,
     Dict,
     Tuple,
-    Optional
+    Optional,
+    Callable
 )
 
 import re
-
-from multipledispatch import dispatch
+import sys
+from collections import OrderedDict
 
 from rply import (
     ParserGenerator,
@@ -25,12 +26,272 @@ else:
 
 # https://joshsharp.com.au/blog/rpython-rply-interpreter-1.html
 
+# Group 1 ALU instructions share the 0x80/0x81/0x83 opcodes and only differ in the
+# ModR/M /digit field, so their immediate forms are encoded from a lookup table
+# indexed by (mnemonic id, width id).
+_ALU_ID = {'ADD': 0, 'OR': 1, 'ADC': 2, 'SBB': 3, 'AND': 4, 'SUB': 5, 'XOR': 6, 'CMP': 7}
+_ALU_REG8_IMM8, _ALU_REG16_IMM16, _ALU_REG16_IMM8 = 0, 1, 2  # Width ids
+_ALU_TABLE = tuple(((0x80, digit), (0x81, digit), (0x83, digit)) for digit in range(8))
+
+# Bits of the FLAGS register
+_CF, _PF, _AF, _ZF, _SF, _OF = 1 << 0, 1 << 2, 1 << 4, 1 << 6, 1 << 7, 1 << 11
+_FLAG_BITS = {'CF': _CF, 'PF': _PF, 'AF': _AF, 'ZF': _ZF, 'SF': _SF, 'OF': _OF}
+
+
+def _parity8(value: int) -> int:
+    """
+    Computes the 8086 parity of a result, which only covers its low byte.
+
+    Args:
+        value (int): Result of an operation.
+
+    Returns:
+        int: 1 if the low byte has an even number of bits set, 0 otherwise.
+    """
+    value &= 0xFF
+    value ^= value >> 4
+    value ^= value >> 2
+    value ^= value >> 1
+    return 1 ^ (value & 1)
+
+
+_BLOCK_CACHE_SIZE = 256  # Assembled blocks kept by InstructionParser.assemble()
+
+_MATCH_MEMO_SIZE = 4096  # Items whose match is remembered by each _RegexTable
+
+_COMPARE_BLOCK_SIZE = 256  # Bytes checked at once by CpuX8086.compare() before looking for differences
+
+_BYTES_PER_ROW = 0x0F  # Bytes shown in each row of the display/cat dumps
+
+# Translation table for dumps: printable ASCII stays as is, any other byte is shown as '.'
+_PRINTABLE = bytes(byte if 0x20 <= byte < 0x7F else ord('.') for byte in range(256))
+
+# Operand shapes by operand kinds. The strings are interned and shared with the
+# _OPCODE_MAP keys, so classifying a line allocates no new shape string.
+_SHAPES = {kinds: sys.intern(', '.join(kinds))
+           for kinds in [('reg',), ('imm',), ('reg', 'reg'), ('reg', 'imm'), ('mem', 'reg'), ('reg', 'mem')]}
+
+# Machine codes by mnemonic and operand shape (see InstructionParser._operand_shape()),
+# shared by every InstructionParser instead of being rebuilt per instance.
+# The 'reg, imm' codes of the Group 1 ALU instructions are their AX (accumulator) short
+# forms; other registers are encoded through _ALU_TABLE.
+_OPCODE_MAP = {
+    'MOV': {'reg, imm': b'\xb8', 'reg, reg': b'\x89', 'mem, reg': b'\x8b', 'reg, mem': b'\x8a'},
+    'ADD': {'reg, imm': b'\x05', 'reg, reg': b'\x01'},
+    'SUB': {'reg, imm': b'\x2d', 'reg, reg': b'\x29'},
+    'AND': {'reg, imm': b'\x25', 'reg, reg': b'\x21'},
+    'OR': {'reg, imm': b'\x0d', 'reg, reg': b'\x09'},
+    'XOR': {'reg, imm': b'\x35', 'reg, reg': b'\x31'},
+    'INC': {'reg': b'\x40'},
+    'DEC': {'reg': b'\x48'},
+    'SHL': {'reg': b'\xd1\xe0'},
+    'SHR': {'reg': b'\xd1\xe8'},
+    'ROL': {'reg': b'\xd1\xc0'},
+    'ROR': {'reg': b'\xd1\xc8'},
+    'NOT': {'reg': b'\xf7\xd0'},
+    'NEG': {'reg': b'\xf7\xd8'},
+    'PUSH': {'reg': b'\x50'},
+    'POP': {'reg': b'\x58'},
+    'INT': {'imm': b'\xcd'},
+}
+_OPCODE_MAP = {sys.intern(mnemonic): {sys.intern(shape): code for shape, code in shapes.items()}
+               for mnemonic, shapes in _OPCODE_MAP.items()}
+
+# Mapeo de registros a sus correspondientes códigos binarios
+_REGISTER_CODES = {'AX': 0b000, 'CX': 0b001, 'DX': 0b010, 'BX': 0b011}
+
+def _build_mnemonic_map(opcode_map: Dict[str, Dict[str, bytes]]) -> Dict[str, str]:
+    """
+    Builds the machine code to mnemonic map from opcode_map, warning about machine codes
+    claimed by more than one mnemonic instead of silently keeping the last one.
+
+    Args:
+        opcode_map (Dict[str, Dict[str, bytes]]): Machine codes by mnemonic and operand shape.
+
+    Returns:
+        Dict[str, str]: Mnemonic and operand shape of each machine code, keyed by its hexadecimal string.
+    """
+    mnemonic_map = {}
+    for mnemonic, shapes in opcode_map.items():
+        for shape, opcode_bytes in shapes.items():
+            code = opcode_bytes.hex().upper()
+            if code in mnemonic_map:
+                Terminal().warning_message(f"InstructionParser: machine code {code} is used by both '{mnemonic_map[code]}' and '{mnemonic} {shape}'.")
+                continue
+            mnemonic_map[code] = sys.intern(f"{mnemonic} {shape}")
+
+    return mnemonic_map
+
+_MNEMONIC_MAP = _build_mnemonic_map(_OPCODE_MAP)
+
+# Bytes that follow the opcode bytes of each operand shape: a ModR/M byte for two
+# operand forms, the immediate word of MOV and the ALU accumulator forms, the INT number.
+# Memory forms also carry the displacement selected by their ModR/M byte.
+_OPERAND_SIZES = {'reg': 0, 'imm': 1, 'reg, reg': 1, 'reg, imm': 2, 'mem, reg': 1, 'reg, mem': 1}
+
+def _build_decode_table(opcode_map: Dict[str, Dict[str, bytes]]) -> Tuple[Tuple[Tuple[bytes, int, str, int, bool], ...], ...]:
+    """
+    Builds the 256-entry decode table for the machine code to instruction path, indexed by first byte.
+    Each slot holds the (opcode bytes, mask for the last opcode byte, 'MNEMONIC shape', operand bytes,
+    memory operand) candidates starting with that byte; the mask clears the register bits of forms
+    that embed a register.
+
+    Args:
+        opcode_map (Dict[str, Dict[str, bytes]]): Machine codes by mnemonic and operand shape.
+
+    Returns:
+        Tuple[Tuple[Tuple[bytes, int, str, int, bool], ...], ...]: Decode candidates of each first byte.
+    """
+    candidates = []
+    for mnemonic, shapes in opcode_map.items():
+        for shape, opcode_bytes in shapes.items():
+            # Accumulator short forms of the ALU instructions have no register bits in the opcode
+            accumulator = mnemonic in _ALU_ID and shape == 'reg, imm'
+            mask = 0xF8 if shape in ('reg', 'reg, imm') and not accumulator else 0xFF
+            candidates.append((opcode_bytes, mask, sys.intern(f"{mnemonic} {shape}"),
+                               _OPERAND_SIZES[shape], 'mem' in shape))
+
+        if mnemonic in _ALU_ID:
+            for alu_opcode, digit in _ALU_TABLE[_ALU_ID[mnemonic]][_ALU_REG16_IMM16:]:
+                # The ModR/M byte is part of the opcode bytes, 0x81 takes an immediate word and 0x83 a byte
+                candidates.append((bytes((alu_opcode, 0xC0 | (digit << 3))), 0xF8, sys.intern(f"{mnemonic} reg, imm"),
+                                   2 if alu_opcode == 0x81 else 1, False))
+
+    table = [[] for _ in range(256)]
+    for candidate in candidates:
+        opcode_bytes, mask = candidate[0], candidate[1]
+        first = opcode_bytes[0]
+        # Single byte forms with the register in the opcode take the 8 slots of their base byte
+        slots = range(first, first + 8) if len(opcode_bytes) == 1 and mask != 0xFF else (first,)
+        for slot in slots:
+            table[slot].append(candidate)
+
+    return tuple(tuple(slot) for slot in table)
+
+_DECODE_TABLE = _build_decode_table(_OPCODE_MAP)
+
+def _canonical_line(line: str) -> str:
+    """
+    Normalizes an assembler line so that spelling variants share a block cache entry.
+
+    Args:
+        line (str): Assembler line, e.g. 'mov  ax ,bx'.
+
+    Returns:
+        str: Uppercased line with single spaces, e.g. 'MOV AX, BX'.
+    """
+    tokens = line.upper().split(None, 1)
+    if len(tokens) < 2:
+        return ''.join(tokens)
+
+    return tokens[0] + ' ' + ', '.join(' '.join(op.split()) for op in tokens[1].split(','))
+
+# Group references in a regex: numbered (\1) and named ((?P=name)) backreferences, and
+# conditionals ((?(1)yes|no)). A literal backslash followed by a digit is a false positive,
+# which only costs the single alternation.
+_GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+class _RegexTable:
+    """
+    Regex dictionary compiled once: items are matched against its keys in order and
+    the value of the first matching key is returned.
+    """
+    __slots__ = ('source', 'values', 'patterns', 'combined', 'memo')
+
+    def __init__(self, table: Dict[str, str]) -> None:
+        """
+        Compiles the keys of a regex dictionary. The dictionary is kept as the table's
+        source and must not change while the table is in use.
+
+        Args:
+            table (Dict[str, str]): Regex dictionary.
+        """
+        self.source = table
+        self.values = tuple(table.values())
+        self.patterns = tuple(re.compile(key) for key in table)
+        self.combined = self._combine(tuple(table), self.patterns)
+        self.memo = {}  # Index of the first matching key by item, None if none matches
+
+    @staticmethod
+    def _combine(keys: Tuple[str, ...], patterns: Tuple["re.Pattern", ...]) -> Optional["re.Pattern"]:
+        """
+        Joins the keys into a single alternation with one named group per key,
+        so a lookup is one match call instead of one per key.
+
+        Args:
+            keys (Tuple[str, ...]): Regex patterns, in dictionary order.
+            patterns (Tuple[re.Pattern, ...]): The same patterns, compiled.
+
+        Returns:
+            Optional[re.Pattern]: Combined pattern whose group 'pN' wraps the N-th key,
+                                  or None if the keys can't be combined.
+        """
+        # Joining the keys renumbers their capture groups, so a group reference would point
+        # at the wrong group and silently stop matching; such keys are scanned one by one
+        if any(_GROUP_REFERENCE.search(key) for key in keys):
+            return None
+
+        try:
+            return re.compile('|'.join(f'(?P<p{i}>{key})' for i, key in enumerate(keys)))
+        except re.error:
+            return None
+
+    def match_index(self, item: str) -> Optional[int]:
+        """
+        Finds the first key that matches an item. Results are memoized per item,
+        since the same lines tend to be looked up over and over.
+
+        Args:
+            item (str): Item to be look for.
+
+        Returns:
+            Optional[int]: Index of the first matching key, or None if none matches.
+        """
+        try:
+            return self.memo[item]
+        except KeyError:
+            pass
+
+        index = None
+        if self.combined is not None:
+            # Alternatives are tried in order, so the first matching key wins as in a linear scan
+            match = self.combined.match(item)
+            if match:
+                index = int(match.lastgroup[1:])
+        else:
+            for position, pattern in enumerate(self.patterns):
+                if pattern.match(item):
+                    index = position
+                    break
+
+        # Start over rather than growing without bound with one-off items
+        if len(self.memo) >= _MATCH_MEMO_SIZE:
+            self.memo.clear()
+        self.memo[item] = index
+
+        return index
+
+    def lookup(self, item: str) -> Optional[str]:
+        """
+        Gets the value of the first key that matches an item.
+
+        Args:
+            item (str): Item to be look for.
+
+        Returns:
+            Optional[str]: Value found, or None if no key matches.
+        """
+        index = self.match_index(item)
+        return None if index is None else self.values[index]
+
 class RegisterSet:
     """
     Represents a set of processor registers and flags.
     Provides methods to get, set, and display registers, as well as update
     flag values based on assembly operations.
     """
+    __slots__ = ('registers', 'flags', 'last_values', 'registers_supported', 'terminal')
+
     def __init__(self)  -> None:
         """
         Initializes processor registers and flags.
@@ -41,8 +302,8 @@ class RegisterSet:
             'SP': 0, 'BP': 0, 'SI': 0, 'DI': 0,
             'CS': 0, 'DS': 0, 'SS': 0, 'ES': 0, 'FS': 0, 'GS': 0
         }
-        # Flags: Zero (ZF), Sign (SF), Parity (PF), and Carry (CF)
-        self.flags = {'ZF': 0, 'SF': 0, 'PF': 0, 'CF': 0}
+        # FLAGS register as a bitmask; arithmetic updates ZF, SF, PF, CF, AF and OF (INC/DEC keep CF), logic and shifts CF and OF
+        self.flags = 0
 
         # Diccionario para rastrear los valores anteriores de los registros
         self.last_values = self.registers.copy()
@@ -50,7 +311,6 @@ class RegisterSet:
         self.terminal = Terminal()
 
 
-    @dispatch(str)
     def get(self, reg: str) -> int:
         """
         Retrieves the value of the specified register.
@@ -63,7 +323,6 @@ class RegisterSet:
         """
         return self.registers.get(reg.upper(), None)
 
-    @dispatch(str, int)
     def set(self, reg: str, value: int) -> None:
         """
         Sets a value in the specified register and updates the previous value.
@@ -81,29 +340,65 @@ class RegisterSet:
             self.last_values[reg] = self.registers[reg]
             self.registers[reg] = value & 0xFFFF
 
-    def update_flags(self, result: int, operation: Optional[str] = None, carry: Optional[bool] = None) -> None:
+    def update_flags(self, result: int, carry: Optional[bool] = None,
+                     aux_carry: Optional[bool] = None, overflow: Optional[bool] = None) -> None:
         """
-        Updates flags (ZF, SF, PF, CF) based on the result of an operation.
+        Updates flags (ZF, SF, PF, and CF/AF/OF when given) based on the result of an operation.
 
         Args:
             result (int): Result of the performed operation.
-            operation (str, optional): Type of operation ('ADD' or 'SUB') to update CF.
-            carry (bool, optional): Indicates if there was a carry for CF in ADD operations.
+            carry (bool, optional): Indicates if there was a carry (or borrow) for CF.
+            aux_carry (bool, optional): Indicates if there was a carry (or borrow) out of bit 3, for AF.
+            overflow (bool, optional): Indicates if there was a signed overflow, for OF.
 
         Returns:
             None
         """
+        mask = _ZF | _SF | _PF
         # Zero Flag: Set if the result is zero
-        self.flags['ZF'] = 1 if result == 0 else 0
+        new_bits = _ZF if result == 0 else 0
         # Sign Flag: Set if the most significant bit is set (negative in signed interpretation)
-        self.flags['SF'] = 1 if (result & 0x8000) != 0 else 0
-        # Parity Flag: Set if the number of bits set in result is even
-        self.flags['PF'] = 1 if bin(result).count("1") % 2 == 0 else 0
-        # Carry Flag: Used in ADD and SUB operations
-        if operation == 'ADD':
-            self.flags['CF'] = 1 if carry else 0
-        elif operation == 'SUB':
-            self.flags['CF'] = 1 if result < 0 else 0
+        new_bits |= _SF if (result & 0x8000) != 0 else 0
+        # Parity Flag: Set if the low byte of the result has an even number of bits set
+        new_bits |= _PF if _parity8(result) else 0
+        # Carry, Auxiliary Carry and Overflow Flags: only when the operation computed them
+        if carry is not None:
+            mask |= _CF
+            new_bits |= _CF if carry else 0
+        if aux_carry is not None:
+            mask |= _AF
+            new_bits |= _AF if aux_carry else 0
+        if overflow is not None:
+            mask |= _OF
+            new_bits |= _OF if overflow else 0
+
+        self.flags = (self.flags & ~mask) | new_bits
+
+    def get_flag(self, flag: str) -> int:
+        """
+        Retrieves the value of a single flag.
+
+        Args:
+            flag (str): Name of the flag (CF, PF, AF, ZF, SF or OF).
+
+        Returns:
+            int: 1 if the flag is set, 0 if not.
+        """
+        return 1 if self.flags & _FLAG_BITS[flag.upper()] else 0
+
+    def set_flag(self, flag: str, value: int) -> None:
+        """
+        Sets or clears a single flag.
+
+        Args:
+            flag (str): Name of the flag (CF, PF, AF, ZF, SF or OF).
+            value (int): 1 to set the flag, 0 to clear it.
+
+        Returns:
+            None
+        """
+        bit = _FLAG_BITS[flag.upper()]
+        self.flags = self.flags | bit if value else self.flags & ~bit
 
     def print_changed_registers(self) -> None:
         """
@@ -142,10 +437,12 @@ class RegisterSet:
 
         # Print the flags below the registers
         self.terminal.info_message("\nStatus Flags:")
-        self.terminal.info_message(f"Zero Flag (ZF): {self.flags['ZF']}")
-        self.terminal.info_message(f"Sign Flag (SF): {self.flags['SF']}")
-        self.terminal.info_message(f"Parity Flag (PF): {self.flags['PF']}")
-        self.terminal.info_message(f"Carry Flag (CF): {self.flags['CF']}")
+        self.terminal.info_message(f"Zero Flag (ZF): {self.get_flag('ZF')}")
+        self.terminal.info_message(f"Sign Flag (SF): {self.get_flag('SF')}")
+        self.terminal.info_message(f"Parity Flag (PF): {self.get_flag('PF')}")
+        self.terminal.info_message(f"Carry Flag (CF): {self.get_flag('CF')}")
+        self.terminal.info_message(f"Auxiliary Carry Flag (AF): {self.get_flag('AF')}")
+        self.terminal.info_message(f"Overflow Flag (OF): {self.get_flag('OF')}")
 
 
     def set_register_upper(self, reg: int, value: int) -> int:
@@ -185,64 +482,19 @@ class InstructionParser:
     Parses and executes assembly instructions, handling arithmetic and bitwise operations
     on registers, and providing detailed error messages.
     """
+    # Static encoding tables, shared by every parser instead of bound per instance
+    opcode_map = _OPCODE_MAP
+    mnemonic_map = _MNEMONIC_MAP
+    decode_table = _DECODE_TABLE
+    register_codes = _REGISTER_CODES
+
     def __init__(self) -> None:
         """
-        Configures the lexer and parser to analyze assembly instructions.
         Initializes the maps of instruction methods and machine codes.
+        The lexer and parser are shared class attributes, see _build_lexer_parser().
         """
-        # Configuración de lexer y parser
-        self.lexer = LexerGenerator()
-        self.lexer.add("OPCODE", r"(?i)mov|add|sub|and|or|xor|not|neg|inc|dec|shl|shr|rol|ror|push|pop|int")
-        self.lexer.add("REGISTER", r"(?i)AX|BX|CX|DX|SP|BP|SI|DI|CS|DS|SS|ES|FS|GS")
-        self.lexer.add("NUMBER", r"0b[01]+|0x[0-9a-fA-F]+|\d+")
-        self.lexer.add("COMMA", r",")
-        self.lexer.add("COMMENT", r";.*")
-        self.lexer.ignore(r"\s+")
-        self.lexer = self.lexer.build()
-
-        self.pg = ParserGenerator(["OPCODE", "REGISTER", "NUMBER", "COMMA"])
-        self.pg.production("instruction : OPCODE operands")(self.handle_instruction)
-        self.pg.production("operands : operand COMMA operand")(self.operands_multiple)
-        self.pg.production("operand : REGISTER")(self.operand_register)
-        self.pg.production("operand : NUMBER")(self.operand_number)
-        self.pg.error(self.handle_parse_error)
-        self.parser = self.pg.build()
         self.terminal = Terminal()
 
-        self.opcode_map = {
-            'MOV': {'reg, imm16': 'B8', 'reg, reg': '89', 'mem, reg': '8B', 'reg, mem': '8A'},
-            'ADD': {'reg, imm16': '05', 'reg, reg': '01'},
-            'SUB': {'reg, imm16': '2D', 'reg, reg': '29'},
-            'AND': {'reg, imm16': '25', 'reg, reg': '21'},
-            'OR': {'reg, imm16': '0D', 'reg, reg': '09'},
-            'XOR': {'reg, imm16': '35', 'reg, reg': '31'},
-            'INC': {'reg': '40'},
-            'DEC': {'reg': '48'},
-            'SHL': {'reg': 'D0E0'},
-            'SHR': {'reg': 'D0E8'},
-            'ROL': {'reg': 'D0C0'},
-            'ROR': {'reg': 'D0C8'},
-            'NOT': {'reg': 'F7D0'},
-            'NEG': {'reg': 'F7D8'},
-            'PUSH': {'reg': '50'},
-            'POP': {'reg': '58'},
-            'INT' : ['0x21'],
-        }
-
-        self.mnemonic_map = {
-            'B8': 'MOV reg, imm16', '89': 'MOV reg, reg', '8B': 'MOV mem, reg', '8A': 'MOV reg, mem',
-            '05': 'ADD reg, imm16', '01': 'ADD reg, reg',
-            '2D': 'SUB reg, imm16', '29': 'SUB reg, reg',
-            '25': 'AND reg, imm16', '21': 'AND reg, reg',
-            '0D': 'OR reg, imm16',  '09': 'OR reg, reg',
-            '35': 'XOR reg, imm16', '31': 'XOR reg, reg',
-            '40': 'INC reg', '48': 'DEC reg',
-            'D0E0': 'SHL reg', 'D0E8': 'SHR reg',
-            'D0C0': 'ROL reg', 'D0C8': 'ROR reg',
-            'F7D0': 'NOT reg', 'F7D8': 'NEG reg',
-            '50': 'PUSH reg', '58': 'POP reg',
-        }
-
         self.opcode_methods = {
             'MOV': self.asm_mov,
             'ADD': self.asm_add,
@@ -264,13 +516,21 @@ class InstructionParser:
 
         self.supported_instructions = list(self.opcode_methods.keys())  # Lista de instrucciones soportadas
 
-        # Mapeo de registros a sus correspondientes códigos binarios
-        self.register_codes = {'AX': '000', 'CX': '001', 'DX': '010', 'BX': '011'}
+        # Machine code emitters for each operand shape of opcode_map
+        self.shape_emitters = {
+            'reg': self._emit_reg,
+            'reg, reg': self._emit_reg_reg,
+            'reg, imm': self._emit_reg_imm,
+            'imm': self._emit_imm,
+        }
 
         # Instancia de RegisterSet
         self.register_collection = RegisterSet()
         self.supported_registers = self.register_collection.registers_supported
 
+        # Encoded bytes of already assembled blocks, in LRU order
+        self._block_cache: "OrderedDict[Tuple[str, ...], Tuple[int, ...]]" = OrderedDict()
+
     def handle_instruction(self, p: list) -> None:
         """
         Calls the appropriate operation method based on the opcode.
@@ -352,13 +612,45 @@ class InstructionParser:
         self.terminal.error_message(f"SYNTAX ERROR: Unexpected token '{token.getstr()}' at position {token.getsourcepos().idx}.")
         self.terminal.info_message("TIP: Check the instruction format. An instruction should follow 'OPCODE REGISTER, NUMBER' or 'OPCODE REGISTER, REGISTER'.")
 
-    def parse(self, instruction: str, memory: Memory) -> dict:
+    def decode(self, machine_code: bytes) -> Optional[Tuple[str, int]]:
         """
-        Parses a single assembly instruction, executes it, and returns its details.
+        Identifies the instruction at the start of a machine code sequence.
+        A single index into decode_table picks the few candidates sharing the first byte.
+        The returned length lets a disassembler step to the next instruction.
+
+        Args:
+            machine_code (bytes): Machine code, starting with the opcode.
+
+        Returns:
+            Optional[Tuple[str, int]]: Mnemonic and operand shape (e.g. 'INC reg') and encoded length
+                                       in bytes, or None if it's not supported or it's truncated.
+        """
+        if not machine_code:
+            return None
+
+        for opcode_bytes, mask, name, operand_size, memory_operand in self.decode_table[machine_code[0]]:
+            last = len(opcode_bytes) - 1
+            if len(machine_code) > last and machine_code[:last] == opcode_bytes[:last] \
+                    and machine_code[last] & mask == opcode_bytes[last]:
+                length = len(opcode_bytes) + operand_size
+                if memory_operand and len(machine_code) > len(opcode_bytes):
+                    # mod 01 adds a displacement byte, mod 10 and direct addressing (mod 00, r/m 110) a word
+                    modrm = machine_code[len(opcode_bytes)]
+                    mod = modrm >> 6
+                    if mod == 0b01:
+                        length += 1
+                    elif mod == 0b10 or (mod == 0b00 and modrm & 0b111 == 0b110):
+                        length += 2
+                return (name, length) if len(machine_code) >= length else None
+
+        return None
+
+    def tokenize(self, instruction: str) -> dict:
+        """
+        Splits a single assembly instruction into its opcode and operands, without executing it.
 
         Args:
             instruction (str): Assembly instruction as a text string.
-            memory (Memory): Memory object representing the system's memory.
 
         Returns:
             dict: Parsed tokens including opcode and operands.
@@ -368,33 +660,58 @@ class InstructionParser:
             KeyError: If the opcode is not supported.
         """
         instruction = instruction.strip().upper()
-        tokens = instruction.split()
+        # A single split separates the opcode from the comma separated operands
+        tokens = instruction.split(None, 1)
 
         if len(tokens) < 1:
             raise ValueError(f"Invalid instruction format: '{instruction}'")
 
-        try:
-            # Handle INT 0x21
-            if tokens[0] == "INT" and len(tokens) == 2 and tokens[1] == "0X21":
-                ah = self.register_collection.get('AX') >> 8  # Obtener AH (parte alta de AX)
-                self.int_0x21(ah, memory, self.register_collection)
-                return {'opcode': 'INT', 'operands': ['0x21']}
+        opcode = tokens[0]
+        operands = [op.strip() for op in tokens[1].split(',')] if len(tokens) > 1 else ['']
+
+        # Convert immediate values (decimal, 0x hexadecimal or 0b binary) to integers
+        for i, operand in enumerate(operands):
+            if operand.isdigit():
+                operands[i] = int(operand)
+            elif operand.startswith(("0X", "0B")):
+                operands[i] = int(operand, 0)
 
-            opcode = tokens[0]
-            if opcode not in self.opcode_methods:
-                raise KeyError(f"Unsupported opcode '{opcode}' in instruction: '{instruction}'")
+        # Handle INT 0x21
+        if opcode == "INT" and operands == [0x21]:
+            return {'opcode': opcode, 'operands': operands}
+
+        if opcode not in self.opcode_methods:
+            raise KeyError(f"Unsupported opcode '{opcode}' in instruction: '{instruction}'")
+
+        # Manejo especial para PUSH y POP (un solo operando)
+        if opcode in ['PUSH', 'POP'] and len(operands) != 1:
+            raise ValueError(f"Invalid operand format for '{opcode}': '{instruction}'")
+
+        return {'opcode': opcode, 'operands': operands}
 
-            # Split operands by comma and strip spaces
-            operands = [op.strip() for op in ' '.join(tokens[1:]).split(',')]
+    def parse(self, instruction: str, memory: Memory) -> dict:
+        """
+        Parses a single assembly instruction, executes it, and returns its details.
 
-            # Manejo especial para PUSH y POP (un solo operando)
-            if opcode in ['PUSH', 'POP'] and len(operands) != 1:
-                raise ValueError(f"Invalid operand format for '{opcode}': '{instruction}'")
+        Args:
+            instruction (str): Assembly instruction as a text string.
+            memory (Memory): Memory object representing the system's memory.
+
+        Returns:
+            dict: Parsed tokens including opcode and operands.
+
+        Raises:
+            ValueError: If the instruction format is invalid or the opcode is not supported.
+        """
+        try:
+            parsed = self.tokenize(instruction)
+            opcode = parsed['opcode']
+            operands = parsed['operands']
 
-            # Convert immediate values to integers
-            for i, operand in enumerate(operands):
-                if operand.isdigit() or operand.startswith("0X"):
-                    operands[i] = int(operand, 16) if operand.startswith("0X") else int(operand)
+            if opcode == 'INT':
+                ah = self.register_collection.get('AX') >> 8  # Obtener AH (parte alta de AX)
+                self.int_0x21(ah, memory, self.register_collection)
+                return parsed
 
             # Invocar el método correspondiente al opcode, pasando `memory` si es necesario
             method = self.opcode_methods[opcode]
@@ -403,10 +720,10 @@ class InstructionParser:
             else:
                 method(operands)
 
-            return {'opcode': opcode, 'operands': operands}
+            return parsed
 
         except Exception as e:
-            raise ValueError(f"Error parsing instruction: '{instruction}' -> {e}")
+            raise ValueError(f"Error parsing instruction: '{instruction.strip().upper()}' -> {e}")
 
     def int_0x21(self, ah: int, memory: dict, registers: dict) -> None:
         """
@@ -502,7 +819,6 @@ class InstructionParser:
         print(f"\nProgram terminated with exit code {exit_code}")
         exit(exit_code)
 
-    @dispatch(list, Memory)
     def asm_push(self, operands: list, memory: Memory) -> None:
         """
         Handles the 'PUSH' instruction.
@@ -526,11 +842,10 @@ class InstructionParser:
         if sp < 0:
             raise ValueError("Stack overflow: SP is below 0")
 
-        memory.poke(sp, value & 0xFF)  # Lower byte
-        memory.poke(sp + 1, (value >> 8) & 0xFF)  # Upper byte
+        # Little endian: lower byte at SP, upper byte at SP + 1
+        memory.poke_block(memory.active_page, sp, value.to_bytes(2, 'little'))
         self.register_collection.set("SP", sp)
 
-    @dispatch(list, Memory)
     def asm_pop(self, operands: list, memory: Memory) -> None:
         """
         Handles the 'POP' instruction.
@@ -552,14 +867,11 @@ class InstructionParser:
         if sp + 2 > 0xFFFF:
             raise ValueError("Stack underflow: SP exceeds memory bounds")
 
-        low = memory.peek(sp)
-        high = memory.peek(sp + 1)
-        value = (high << 8) | low
+        value = int.from_bytes(memory.view(memory.active_page)[sp:sp + 2], 'little')
         self.register_collection.set(reg, value)
         self.register_collection.set("SP", sp + 2)
 
     # Operaciones de ensamblador
-    @dispatch(list)
     def asm_mov(self, operands: list) -> None:
         """
         Executes the MOV instruction, moving a value to a register.
@@ -580,7 +892,6 @@ class InstructionParser:
             self.terminal.error_message(f"ERROR: Invalid register '{dest}' or '{src}' in MOV operation.")
             self.terminal.info_message("TIP: Ensure that both operands are valid registers or an immediate value.")
 
-    @dispatch(list)
     def asm_add(self, operands: list) -> None:
         """
         Executes the ADD instruction, adding a value to a register.
@@ -593,14 +904,20 @@ class InstructionParser:
         """
         try:
             dest, src = operands
-            result = self.register_collection.get(dest) + (src if isinstance(src, int) else self.register_collection.get(src))
+            a = self.register_collection.get(dest)
+            b = src & 0xFFFF if isinstance(src, int) else self.register_collection.get(src)
+            result = a + b
             self.register_collection.set(dest, result & 0xFFFF)
-            self.register_collection.update_flags(result, operation='ADD')
+            # A single native add; the carry out of bit 15 is whatever doesn't fit in 16 bits,
+            # the auxiliary carry is the one out of bit 3, and there is an overflow when both
+            # operands have the same sign and the result doesn't
+            self.register_collection.update_flags(result & 0xFFFF, carry=result > 0xFFFF,
+                                                  aux_carry=(a & 0xF) + (b & 0xF) > 0xF,
+                                                  overflow=((a ^ result) & (b ^ result) & 0x8000) != 0)
         except KeyError:
             self.terminal.error_message(f"ERROR: Invalid register '{dest}' or '{src}' in ADD operation.")
             self.terminal.info_message("TIP: Both operands must be valid registers or an immediate value.")
 
-    @dispatch(list)
     def asm_sub(self, operands: list) -> None:
         """
         Executes the SUB instruction, subtracting a value from a register.
@@ -613,14 +930,19 @@ class InstructionParser:
         """
         try:
             dest, src = operands
-            result = self.register_collection.get(dest) - (src if isinstance(src, int) else self.register_collection.get(src))
-            self.register_collection.set(dest, result & 0xFFFF)
-            self.register_collection.update_flags(result, operation='SUB')
+            a = self.register_collection.get(dest)
+            b = src & 0xFFFF if isinstance(src, int) else self.register_collection.get(src)
+            result = (a - b) & 0xFFFF
+            self.register_collection.set(dest, result)
+            # A borrow into bit 15 sets CF and one into bit 3 sets AF; there is an overflow
+            # when the operands have different signs and the result's sign differs from a
+            self.register_collection.update_flags(result, carry=a < b,
+                                                  aux_carry=(a & 0xF) < (b & 0xF),
+                                                  overflow=((a ^ b) & (a ^ result) & 0x8000) != 0)
         except KeyError:
             self.terminal.error_message(f"ERROR: Invalid register '{dest}' or '{src}' in SUB operation.")
             self.terminal.info_message("TIP: Both operands must be valid registers or an immediate value.")
 
-    @dispatch(list)
     def asm_and(self, operands: list) -> None:
         """
         Executes the AND instruction, performing a bitwise AND on a register.
@@ -633,14 +955,14 @@ class InstructionParser:
         """
         try:
             dest, src = operands
-            result = self.register_collection.get(dest) & (src if isinstance(src, int) else self.register_collection.get(src))
+            result = self.register_collection.get(dest) & (src & 0xFFFF if isinstance(src, int) else self.register_collection.get(src))
             self.register_collection.set(dest, result)
-            self.register_collection.update_flags(result)
+            # Logical instructions always clear CF and OF
+            self.register_collection.update_flags(result, carry=False, overflow=False)
         except KeyError:
             self.terminal.error_message(f"ERROR: Invalid register '{dest}' or '{src}' in AND operation.")
             self.terminal.info_message("TIP: Both operands must be valid registers or an immediate value.")
 
-    @dispatch(list)
     def asm_or(self, operands: list) -> None:
         """
         Executes the OR instruction, performing a bitwise OR on a register.
@@ -653,14 +975,14 @@ class InstructionParser:
         """
         try:
             dest, src = operands
-            result = self.register_collection.get(dest) | (src if isinstance(src, int) else self.register_collection.get(src))
+            result = self.register_collection.get(dest) | (src & 0xFFFF if isinstance(src, int) else self.register_collection.get(src))
             self.register_collection.set(dest, result)
-            self.register_collection.update_flags(result)
+            # Logical instructions always clear CF and OF
+            self.register_collection.update_flags(result, carry=False, overflow=False)
         except KeyError:
             self.terminal.error_message(f"ERROR: Invalid register '{dest}' or '{src}' in OR operation.")
             self.terminal.info_message("TIP: Both operands must be valid registers or an immediate value.")
 
-    @dispatch(list)
     def asm_xor(self, operands: list) -> None:
         """
         Executes the XOR instruction, performing a bitwise XOR on a register.
@@ -673,14 +995,14 @@ class InstructionParser:
         """
         try:
             dest, src = operands
-            result = self.register_collection.get(dest) ^ (src if isinstance(src, int) else self.register_collection.get(src))
+            result = self.register_collection.get(dest) ^ (src & 0xFFFF if isinstance(src, int) else self.register_collection.get(src))
             self.register_collection.set(dest, result)
-            self.register_collection.update_flags(result)
+            # Logical instructions always clear CF and OF
+            self.register_collection.update_flags(result, carry=False, overflow=False)
         except KeyError:
             self.terminal.error_message(f"ERROR: Invalid register '{dest}' or '{src}' in XOR operation.")
             self.terminal.info_message("TIP: Both operands must be valid registers or an immediate value.")
 
-    @dispatch(list)
     def asm_not(self, operands: list) -> None:
         """
         Executes the NOT instruction, performing a bitwise NOT on a register.
@@ -700,7 +1022,6 @@ class InstructionParser:
             self.terminal.error_message(f"ERROR: Invalid register '{dest}' in NOT operation.")
             self.terminal.info_message("TIP: Ensure the operand is a valid register.")
 
-    @dispatch(list)
     def asm_neg(self, operands: list) -> None:
         """
         Executes the NEG instruction, negating the value of a register.
@@ -713,14 +1034,18 @@ class InstructionParser:
         """
         try:
             dest = operands[0]
-            result = -self.register_collection.get(dest) & 0xFFFF
+            value = self.register_collection.get(dest)
+            result = -value & 0xFFFF
             self.register_collection.set(dest, result)
-            self.register_collection.update_flags(result, operation='SUB')
+            # NEG is 0 - value: CF and AF are set unless the operand (or its low nibble) was zero,
+            # and only -0x8000 overflows
+            self.register_collection.update_flags(result, carry=value != 0,
+                                                  aux_carry=(value & 0xF) != 0,
+                                                  overflow=value == 0x8000)
         except KeyError:
             self.terminal.error_message(f"ERROR: Invalid register '{dest}' in NEG operation.")
             self.terminal.info_message("TIP: Ensure the operand is a valid register.")
 
-    @dispatch(list)
     def asm_inc(self, operands: list) -> None:
         """
         Executes the INC instruction, incrementing the value of a register by one.
@@ -733,14 +1058,16 @@ class InstructionParser:
         """
         try:
             dest = operands[0]
-            result = self.register_collection.get(dest) + 1
-            self.register_collection.set(dest, result & 0xFFFF)
-            self.register_collection.update_flags(result)
+            value = self.register_collection.get(dest)
+            result = (value + 1) & 0xFFFF
+            self.register_collection.set(dest, result)
+            # Like ADD 1 but CF is left untouched
+            self.register_collection.update_flags(result, aux_carry=(value & 0xF) == 0xF,
+                                                  overflow=value == 0x7FFF)
         except KeyError:
             self.terminal.error_message(f"ERROR: Invalid register '{dest}' in INC operation.")
             self.terminal.info_message("TIP: Ensure the operand is a valid register.")
 
-    @dispatch(list)
     def asm_dec(self, operands: list) -> None:
         """
         Executes the DEC instruction, decrementing the value of a register by one.
@@ -753,14 +1080,16 @@ class InstructionParser:
         """
         try:
             dest = operands[0]
-            result = self.register_collection.get(dest) - 1
-            self.register_collection.set(dest, result & 0xFFFF)
-            self.register_collection.update_flags(result, operation='SUB')
+            value = self.register_collection.get(dest)
+            result = (value - 1) & 0xFFFF
+            self.register_collection.set(dest, result)
+            # Like SUB 1 but CF is left untouched
+            self.register_collection.update_flags(result, aux_carry=(value & 0xF) == 0,
+                                                  overflow=value == 0x8000)
         except KeyError:
             self.terminal.error_message(f"ERROR: Invalid register '{dest}' in DEC operation.")
             self.terminal.info_message("TIP: Ensure the operand is a valid register.")
 
-    @dispatch(list)
     def asm_shl(self, operands: list) -> None:
         """
         Executes the SHL instruction, performing a bitwise shift left on a register.
@@ -790,14 +1119,16 @@ class InstructionParser:
         """
         try:
             dest = operands[0]
-            result = self.register_collection.get(dest) << 1
-            self.register_collection.set(dest, result & 0xFFFF)
-            self.register_collection.update_flags(result)
+            value = self.register_collection.get(dest)
+            result = (value << 1) & 0xFFFF
+            self.register_collection.set(dest, result)
+            # CF gets the bit shifted out of the top; OF is set when the sign bit changed
+            self.register_collection.update_flags(result, carry=(value & 0x8000) != 0,
+                                                  overflow=((value ^ result) & 0x8000) != 0)
         except KeyError:
             self.terminal.error_message(f"ERROR: Invalid register '{dest}' in SHL operation.")
             self.terminal.info_message("TIP: Ensure the operand is a valid register.")
 
-    @dispatch(list)
     def asm_shr(self, operands: list) -> None:
         """
         Executes the SHR instruction, performing a bitwise shift right on a register.
@@ -810,14 +1141,16 @@ class InstructionParser:
         """
         try:
             dest = operands[0]
-            result = self.register_collection.get(dest) >> 1
+            value = self.register_collection.get(dest)
+            result = value >> 1
             self.register_collection.set(dest, result)
-            self.register_collection.update_flags(result)
+            # CF gets the bit shifted out of the bottom; OF is the original sign bit
+            self.register_collection.update_flags(result, carry=(value & 1) != 0,
+                                                  overflow=(value & 0x8000) != 0)
         except KeyError:
             self.terminal.error_message(f"ERROR: Invalid register '{dest}' in SHR operation.")
             self.terminal.info_message("TIP: Ensure the operand is a valid register.")
 
-    @dispatch(list)
     def asm_rol(self, operands: list) -> None:
         """
         Executes the ROL instruction, performing a bitwise rotate left on a register.
@@ -838,7 +1171,6 @@ class InstructionParser:
             self.terminal.error_message(f"ERROR: Invalid register '{dest}' in ROL operation.")
             self.terminal.info_message("TIP: Ensure the operand is a valid register.")
 
-    @dispatch(list)
     def asm_ror(self, operands: list) -> None:
         """
         Executes the ROR instruction, performing a bitwise rotate right on a register.
@@ -860,56 +1192,157 @@ class InstructionParser:
             self.terminal.info_message("TIP: Ensure the operand is a valid register.")
 
 
+    def _operand_shape(self, operands: list) -> str:
+        """
+        Classifies the operands of a tokenized instruction into an opcode_map shape.
+
+        Args:
+            operands (list): Operands as returned by tokenize().
+
+        Returns:
+            str: Operand shape such as 'reg, reg' or 'reg, imm', or '' if an operand is not supported.
+        """
+        kinds = []
+        for operand in operands:
+            if isinstance(operand, int):
+                kinds.append('imm')
+            elif operand in self.register_codes:
+                kinds.append('reg')
+            else:
+                return ''
+
+        return _SHAPES.get(tuple(kinds), '')
+
+    def _emit_reg(self, opcode: str, encoding: bytes, operands: list) -> List[int]:
+        """
+        Encodes a single register operand instruction (INC, DEC, PUSH, POP, shifts, NOT, NEG).
+        The register goes in the low bits of the last opcode byte.
+
+        Args:
+            opcode (str): Mnemonic of the instruction.
+            encoding (bytes): Opcode bytes from opcode_map.
+            operands (list): Operands as returned by tokenize().
+
+        Returns:
+            List[int]: Machine code bytes.
+        """
+        return [*encoding[:-1], encoding[-1] | _REGISTER_CODES[operands[0]]]
+
+    def _emit_reg_reg(self, opcode: str, encoding: bytes, operands: list) -> List[int]:
+        """
+        Encodes a register to register instruction with a register-direct ModR/M byte.
+
+        Args:
+            opcode (str): Mnemonic of the instruction.
+            encoding (bytes): Opcode bytes from opcode_map.
+            operands (list): Operands as returned by tokenize().
+
+        Returns:
+            List[int]: Machine code bytes.
+        """
+        dest, src = operands
+        return [encoding[0], 0xC0 | (_REGISTER_CODES[src] << 3) | _REGISTER_CODES[dest]]
+
+    def _emit_reg_imm(self, opcode: str, encoding: bytes, operands: list) -> List[int]:
+        """
+        Encodes a register, immediate instruction. Group 1 ALU instructions use the
+        0x81/0x83 forms, or the opcode_map accumulator form for AX with a word immediate;
+        MOV puts the register in its opcode byte.
+
+        Args:
+            opcode (str): Mnemonic of the instruction.
+            encoding (bytes): Opcode bytes from opcode_map.
+            operands (list): Operands as returned by tokenize().
+
+        Returns:
+            List[int]: Machine code bytes.
+        """
+        dest, src = operands
+        reg = _REGISTER_CODES[dest]
+        imm_value = src & 0xFFFF
+        if opcode not in _ALU_ID:
+            return [encoding[0] | reg, imm_value & 0xFF, imm_value >> 8]
+
+        # Immediates that fit a sign-extended byte use the shorter 0x83 form
+        width_id = _ALU_REG16_IMM8 if imm_value <= 0x7F or imm_value >= 0xFF80 else _ALU_REG16_IMM16
+        if width_id == _ALU_REG16_IMM16 and dest == 'AX':
+            # AX has an accumulator form without ModR/M byte, one byte shorter than 0x81
+            return [encoding[0], imm_value & 0xFF, imm_value >> 8]
+
+        alu_opcode, digit = _ALU_TABLE[_ALU_ID[opcode]][width_id]
+        code = [alu_opcode, 0xC0 | (digit << 3) | reg, imm_value & 0xFF]
+        if width_id == _ALU_REG16_IMM16:
+            code.append(imm_value >> 8)
+
+        return code
+
+    def _emit_imm(self, opcode: str, encoding: bytes, operands: list) -> List[int]:
+        """
+        Encodes a single byte immediate instruction (INT).
+
+        Args:
+            opcode (str): Mnemonic of the instruction.
+            encoding (bytes): Opcode bytes from opcode_map.
+            operands (list): Operands as returned by tokenize().
+
+        Returns:
+            List[int]: Machine code bytes.
+        """
+        return [encoding[0], operands[0] & 0xFF]
+
     def assemble(self, asm_code: str, memory: Memory) -> List[int]:
         """
         Converts assembly code into machine code as a list of byte integers.
+        The instructions are not executed, and the encoded bytes of each block are cached.
 
         Args:
             asm_code (str): Multiline string of assembly code instructions.
+            memory (Memory): Memory object representing the system's memory.
 
         Returns:
             List[int]: Machine code as an array of integer bytes.
         """
-        machine_code = []
         lines = asm_code.strip().splitlines()
 
+        # There are no jump instructions yet, so the whole input is a single basic block.
+        block = tuple(_canonical_line(line) for line in lines if line.strip())
+        cached = self._block_cache.get(block)
+        if cached is not None:
+            self._block_cache.move_to_end(block)
+            return list(cached)
+
+        machine_code = []
+        failed = False
+
         for line_num, line in enumerate(lines, 1):
             if not line.strip():
                 continue
 
             try:
-                # Use parse() to validate and extract the instruction details
-                parsed = self.parse(line, memory)
+                # Use tokenize() to validate and extract the instruction details
+                parsed = self.tokenize(line)
                 opcode = parsed['opcode']
                 operands = parsed['operands']
 
-                # Generate machine code based on operands
-                if len(operands) == 2:
-                    dest, src = operands
-
-                    # reg, imm16
-                    if src.isdigit() or src.startswith("0X"):
-                        op_key = 'reg, imm16'
-                        opcode_hex = self.opcode_map[opcode][op_key]
-                        opcode_hex = f"{int(opcode_hex, 16) + int(self.register_codes[dest], 2):02X}"
-                        imm_value = int(src, 16) if src.startswith("0X") else int(src)
-                        imm_hex = f"{imm_value:04X}"
-                        machine_code.extend([int(opcode_hex, 16)] + [int(imm_hex[i:i+2], 16) for i in range(0, 4, 2)])
-
-                    # reg, reg
-                    elif dest in self.register_codes and src in self.register_codes:
-                        op_key = 'reg, reg'
-                        opcode_hex = self.opcode_map[opcode][op_key]
-                        mod_reg_rm = f"{int(self.register_codes[src] + self.register_codes[dest], 2):02X}"
-                        machine_code.extend([int(opcode_hex, 16), int(mod_reg_rm, 16)])
-
-                    else:
-                        raise ValueError(f"Unsupported operand format in line {line_num}: '{line}'")
+                # Classify the operands once, then a single (mnemonic, shape) lookup picks the encoding
+                shape = self._operand_shape(operands)
+                encoding = _OPCODE_MAP[opcode].get(shape) if shape else None
+                if encoding is None:
+                    raise ValueError(f"Unsupported operand format in line {line_num}: '{line}'")
+
+                machine_code.extend(self.shape_emitters[shape](opcode, encoding, operands))
 
             except (ValueError, KeyError) as e:
                 self.terminal.error_message(f"ERROR: {e}")
+                failed = True
                 continue
 
+        # Only blocks that assembled cleanly are cached, so errors are reported every time.
+        if not failed:
+            self._block_cache[block] = tuple(machine_code)
+            if len(self._block_cache) > _BLOCK_CACHE_SIZE:
+                self._block_cache.popitem(last=False)
+
         return machine_code
 
     def execute_and_print(self, instruction: str, memory: Memory) -> None:
@@ -928,6 +1361,59 @@ class InstructionParser:
         except Exception as e:
             self.terminal.error_message(f"ERROR: Execution failed for instruction '{instruction}'. Details: {e}")
 
+_LEXER_OPCODES = ('MOV', 'ADD', 'SUB', 'AND', 'OR', 'XOR', 'NOT', 'NEG', 'INC', 'DEC',
+                  'SHL', 'SHR', 'ROL', 'ROR', 'PUSH', 'POP', 'INT')
+_LEXER_REGISTERS = ('AX', 'BX', 'CX', 'DX', 'SP', 'BP', 'SI', 'DI',
+                    'CS', 'DS', 'SS', 'ES', 'FS', 'GS')
+
+
+def _keyword_pattern(words: Tuple[str, ...]) -> str:
+    """
+    Builds a case-insensitive, whole-word alternation for a lexer rule.
+
+    Longer words are tried first and the alternation is bounded by \\b, so a
+    keyword never matches as the prefix of a longer identifier.
+
+    Args:
+        words (Tuple[str, ...]): Keywords accepted by the rule.
+
+    Returns:
+        str: The regular expression source.
+    """
+    ordered = sorted(words, key=len, reverse=True)
+    return r"(?i)\b(?:" + "|".join(map(re.escape, ordered)) + r")\b"
+
+
+def _build_lexer_parser() -> tuple:
+    """
+    Builds the assembly lexer and the LALR parser once for every InstructionParser.
+
+    Productions are registered as unbound methods; the instance is supplied as the
+    parse state, i.e. parser.parse(lexer.lex(text), state=instruction_parser).
+
+    Returns:
+        tuple: The built (lexer, parser) pair.
+    """
+    # Configuración de lexer y parser
+    lg = LexerGenerator()
+    lg.add("OPCODE", _keyword_pattern(_LEXER_OPCODES))
+    lg.add("REGISTER", _keyword_pattern(_LEXER_REGISTERS))
+    lg.add("NUMBER", r"0b[01]+|0x[0-9a-fA-F]+|\d+")
+    lg.add("COMMA", r",")
+    lg.add("COMMENT", r";.*")
+    lg.ignore(r"\s+")
+
+    pg = ParserGenerator(["OPCODE", "REGISTER", "NUMBER", "COMMA"])
+    pg.production("instruction : OPCODE operands")(InstructionParser.handle_instruction)
+    pg.production("operands : operand COMMA operand")(InstructionParser.operands_multiple)
+    pg.production("operand : REGISTER")(InstructionParser.operand_register)
+    pg.production("operand : NUMBER")(InstructionParser.operand_number)
+    pg.error(InstructionParser.handle_parse_error)
+    return lg.build(), pg.build()
+
+
+InstructionParser.lexer, InstructionParser.parser = _build_lexer_parser()
+
 class CpuX8086():
     """
     Class emulating a 8086 CPU.
@@ -938,6 +1424,7 @@ class CpuX8086():
         self.instructions_set = self.instruction_parser.supported_instructions
         self.register_set = self.instruction_parser.supported_registers
         self.terminal = Terminal()
+        self._regex_table = None  # _RegexTable of the last dictionary given to _find_matches()
 
     def parse_instruction(self, cmd: str, memory: Memory) -> None:
         """Parse the assembler instructions affecting the registers if necesary.
@@ -965,13 +1452,15 @@ class CpuX8086():
             Dict[str]: Item found, or None if not.
 
         """
-        for k in d:
-            if re.match(k, item):
-                return d[k]
+        # The keys are compiled once per dictionary; passing another dictionary rebuilds the table
+        table = self._regex_table
+        if table is None or table.source is not d:
+            table = self._regex_table = _RegexTable(d)
 
-        return None
+        return table.lookup(item)
 
-    def _16to8(self, hl: int) -> Tuple[int]:
+    @staticmethod
+    def _16to8(hl: int) -> Tuple[int, int]:
         """Decode a 16-bit number in 2 8-bit numbers
 
         Parameters:
@@ -981,39 +1470,50 @@ class CpuX8086():
             int, int: 8-bit higher part and 8-bit lower part, respectively.
 
         """
-        h = int(hl / 256)
-        l = h % 256
+        return (hl >> 8) & 0xFF, hl & 0xFF
 
-        return h, l
+    @staticmethod
+    def _8to16(h: int, l: int) -> int:
+        """Encode 2 8-bit numbers in a 16-bit number
+
+        Parameters:
+            h (int): 8-bit higher part.
+            l (int): 8-bit lower part.
+
+        Returns:
+            int: 16-bit number.
+
+        """
+        return ((h & 0xFF) << 8) | (l & 0xFF)
 
     @staticmethod
     def _not_yet():
         print("This part of the CPU hasn't been implemented yet. =)")
 
-    @dispatch(int)
-    def get_bin(self, x: int) -> str:
+    def get_bin(self, x: int, bits: int = 16) -> str:
         """Convert any integer into n bit binary format.
 
         Parameters:
             x (int): The integer to be converted.
+            bits (int): Number of bits. Defaults to 16.
 
         Returns:
-            str: 16 bit binary as string.
+            str: n bit binary as string.
         """
-        return format(x, '016b')
+        return format(x, f'0{bits}b')
 
-    @dispatch(int)
-    def get_hex(self, x: int) -> str:
-        """Convert any integer into 16 bit hexadecimal format.
+    def get_hex(self, x: int, bits: int = 16) -> str:
+        """Convert any integer into n bit hexadecimal format.
 
         Parameters:
             x (int): The integer to be converted.
+            bits (int): Number of bits. Defaults to 16.
 
         Returns:
-            str: 16 bit hexadecimal as string.
+            str: n bit hexadecimal as string.
         """
 
-        return format(x, '04X')
+        return format(x, f'0{bits // 4}X')
 
     def assemble(self, memory: Memory, code: str) -> str:
         """
@@ -1029,8 +1529,7 @@ class CpuX8086():
 
         machine_code = self.instruction_parser.assemble(code, memory)
         if len(machine_code)>0:
-            self.terminal.info_message("Machine code:", machine_code)
-            memory.offset_cursor+=len(machine_code)
+            self.terminal.info_message(f"Machine code: {' '.join(f'{byte:02X}' for byte in machine_code)}")
 
         return machine_code
 
@@ -1038,6 +1537,10 @@ class CpuX8086():
         """ Print the CPU registers and it's value."""
         self.instruction_parser.register_collection.print_registers()
 
+    def set_flag(self, flag: str, value: int) -> None:
+        """ Set (1) or clear (0) a CPU flag by name (CF, PF, AF, ZF, SF or OF)."""
+        self.instruction_parser.register_collection.set_flag(flag, value)
+
     def move(self, memory: Memory, from_begin: int, from_end: int, destination: int) -> bool:
         """Copy a memory region to other memory region.
 
@@ -1051,13 +1554,12 @@ class CpuX8086():
             bool: Operation result.
         """
 
-        if destination > from_end:
-            for source in range(from_begin, from_end):
-                dist_pointer = from_begin \
-                    if destination + source == from_begin else destination + source - from_begin
-                memory.poke(memory.active_page, dist_pointer,
-                            memory.peek(memory.active_page, source))
-            self.terminal.success_message(f"{from_end - from_begin} byte/s copied.")
+        if from_begin <= from_end:
+            # The source is snapshotted before the slice assignment, so overlapping regions copy like memmove
+            block = memory.view(memory.active_page)[from_begin:from_end].tobytes()
+            if not memory.poke_block(memory.active_page, destination, block):
+                return False
+            self.terminal.success_message(f"{len(block)} byte/s copied.")
             return True
 
         self.terminal.error_message("Invalid value.")
@@ -1073,16 +1575,22 @@ class CpuX8086():
             pattern (str): Pattern.
 
         Returns:
-            bool: Operation result. Always true.
+            bool: Operation result.
         """
-        cursor = 0
-        for idx in range(start, end):
-            memory.poke(memory.active_page, idx, ord(pattern[cursor]))
-            cursor += 1
-            if cursor > len(pattern) - 1:
-                cursor = 0
+        if not pattern or end <= start:
+            return True
+
+        try:
+            pattern_bytes = pattern.encode('latin-1')
+        except UnicodeEncodeError:
+            self.terminal.error_message("Invalid value.")
+            return False
+
+        # Repeat the pattern to cover the region and write it in one go
+        length = end - start
+        block = (pattern_bytes * (length // len(pattern_bytes) + 1))[:length]
 
-        return True
+        return memory.poke_block(memory.active_page, start, block)
 
     def search(self, memory: Memory, start: int, pattern: str) -> List[str]:
         """Search a pattern in the memory. Staring from <start> to the end of the page.
@@ -1096,23 +1604,20 @@ class CpuX8086():
             [str]
         """
         found_list = []
-        pointer = start
-        while pointer < memory._offsets:
-            idx = 0
-
-            # Did I find the first char of the pattern? If so, let's search for the rest
-            if memory.peek(memory.active_page, pointer) == ord(pattern[idx]):
-                pointer_aux = pointer
-                while idx < len(pattern) and pointer_aux < memory._offsets and \
-                        memory.peek(memory.active_page, pointer_aux) == ord(pattern[idx]):
-                    idx += 1
-                    pointer_aux += 1
+        try:
+            needle = pattern.encode('latin-1')
+        except UnicodeEncodeError:
+            return found_list
 
-                if pointer_aux - pointer == len(pattern):
-                    found_list.append(
-                        f"{'%04X' % memory.active_page}:{'%04X' % pointer}")
+        if not needle:
+            return found_list
 
-            pointer += 1
+        # bytes.find() scans the page in C; overlapping matches are found by resuming one byte later
+        haystack = memory.view(memory.active_page).tobytes()
+        pointer = haystack.find(needle, start)
+        while pointer != -1:
+            found_list.append(f"{memory.active_page:04X}:{pointer:04X}")
+            pointer = haystack.find(needle, pointer + 1)
 
         return found_list
 
@@ -1128,8 +1633,14 @@ class CpuX8086():
         Returns:
             None
         """
-        for idx in range(0, len(text) - 1):
-            memory.poke(memory.active_page, start + idx, ord(text[idx]))
+        # The last character is left out (it's the closing quote of the 'e' command)
+        try:
+            block = text[:-1].encode('latin-1')
+        except UnicodeEncodeError:
+            self.terminal.error_message("Invalid value.")
+            return
+
+        memory.poke_block(memory.active_page, start, block)
 
     def compare(self, memory: Memory, cfrom: int, cend: int, cto: int) -> List[str]:
         """
@@ -1144,17 +1655,29 @@ class CpuX8086():
         Returns:
             [str]: The differences between regions.
         """
-        diffs = []
+        # Both regions must fit the page, otherwise the destination slice comes out short
+        # and the differences past its end would be silently dropped
+        offsets = memory.get_num_memory_offsets()
+        if not (0 <= cfrom <= cend <= offsets and 0 <= cto <= offsets - (cend - cfrom)):
+            self.terminal.error_message("Invalid value.")
+            return []
 
-        for a in range(cfrom, cend):
-            org = memory.peek(memory.active_page, a)
-            dist_pointer = cfrom if cto + a == cfrom else cto + a - cfrom - 1
+        page = memory.active_page
+        view = memory.view(page)
+        source = view[cfrom:cend].tobytes()
+        destination = view[cto:cto + len(source)].tobytes()
+
+        diffs = []
+        for block in range(0, len(source), _COMPARE_BLOCK_SIZE):
+            org_block = source[block:block + _COMPARE_BLOCK_SIZE]
+            dist_block = destination[block:block + _COMPARE_BLOCK_SIZE]
+            # Equal blocks are skipped with a single memcmp, only different ones are walked byte by byte
+            if org_block == dist_block:
+                continue
 
-            dist = memory.peek(memory.active_page, dist_pointer)
-            if org != dist:
-                diffs.append('%04X' % memory.active_page + ":" + '%04X' % a + " " +
-                             '%02X' % org + " " + '%02X' % dist + " " +
-                             '%04X' % memory.active_page + ":" + '%04X' % dist_pointer)
+            for offset, (org, dist) in enumerate(zip(org_block, dist_block), block):
+                if org != dist:
+                    diffs.append(f"{page:04X}:{cfrom + offset:04X} {org:02X} {dist:02X} {page:04X}:{cto + offset:04X}")
 
         return diffs
 
@@ -1170,33 +1693,7 @@ class CpuX8086():
         Returns:
 
         """
-        bytes_per_row = int("F", 16)
-        pointer = 0
-        ascvisual = ""
-
-        if addrn - addrb < bytes_per_row:  # One single row
-            print(f"{'%06X' % (pointer + addrb)} ", end="", flush=True)
-            for address in range(addrb, addrn):
-                byte = disk.read(pointer + addrb)
-                peek = "%02X" % byte
-                ascvisual += chr(byte) if chr(byte).isprintable() else "."
-                self.terminal.success_message(f"{peek} ", end="", flush=True)
-
-            self.terminal.success_message(" " * ((bytes_per_row - pointer) * 3) + ascvisual)
-        else:  # two or more rows
-            while pointer + addrb < addrn:
-                if pointer % bytes_per_row == 0:
-                    self.terminal.success_message(" " * ((bytes_per_row - pointer) * 3) + ascvisual)
-                    ascvisual = ""
-                    self.terminal.success_message(f"{'%06X' % (pointer + addrb)} ", end="", flush=True)
-
-                byte = disk.read(pointer + addrb)
-                peek = "%02X" % byte
-                ascvisual += chr(byte) if chr(byte).isprintable() else "."
-                self.terminal.success_message(f"{peek} ", end="", flush=True)
-                pointer += 1
-
-        print("")
+        self._dump(disk.read_block(addrb, addrn - addrb), addrb, lambda address: f"{address:06X}")
 
     def display(self, memory: Memory, addrb: int, addrn: int) -> None:
         """
@@ -1211,34 +1708,34 @@ class CpuX8086():
             None.
         """
         page = memory.active_page
-        bytes_per_row = int("F", 16)
-        pointer = 0
-        ascvisual = ""
-
-        if addrn - addrb < bytes_per_row:  # One single row
-            self.terminal.success_message(
-                f"{'%04X' % memory.active_page}:{'%04X' % (pointer + addrb)} ", end="", flush=True)
-            for address in range(addrb, addrn):
-                byte = memory.peek(page, pointer + addrb)
-                peek = "%02X" % byte
-                ascvisual += chr(byte) if chr(byte).isprintable() else "."
-                self.terminal.success_message(f"{peek} ", end="", flush=True)
-
-            print(" " * ((bytes_per_row - pointer) * 3) + ascvisual)
-        else:  # two or more rows
-            while pointer + addrb < addrn:
-                if pointer % bytes_per_row == 0:
-                    print(" " * ((bytes_per_row - pointer) * 3) + ascvisual)
-                    ascvisual = ""
-                    self.terminal.success_message(f"{'%04X' % memory.active_page}:{'%04X' % (pointer + addrb)} ", end="")
-
-                byte = memory.peek(page, pointer + addrb)
-                peek = "%02X" % byte
-                ascvisual += chr(byte) if chr(byte).isprintable() else "."
-                self.terminal.success_message(f"{peek} ", end="", flush=True)
-                pointer += 1
-
-        print("")
+        data = memory.view(page)[addrb:addrn].tobytes()
+        self._dump(data, addrb, lambda address: f"{page:04X}:{address:04X}")
+
+    def _dump(self, data: bytes, addrb: int, label: Callable[[int], str]) -> None:
+        """
+        Prints a block of bytes as rows of address, hexadecimal values and ASCII.
+        Each row (highlighted address and hexadecimal values, then the ASCII column)
+        is built as one line and printed with a single call.
+
+        Args:
+            data (bytes): Bytes to be shown.
+            addrb (int): Address of the first byte.
+            label (Callable[[int], str]): Formats the address shown at the start of a row.
+
+        Returns:
+            None.
+        """
+        # Same style as Terminal.success_message(), applied to the address and hexadecimal columns only
+        highlight = f"{AnsiColors.GREEN.value}{AnsiColors.BOLD.value}"
+        reset = AnsiColors.RESET.value
+
+        for offset in range(0, len(data), _BYTES_PER_ROW):
+            chunk = data[offset:offset + _BYTES_PER_ROW]
+            ascvisual = chunk.translate(_PRINTABLE).decode('ascii')
+            padding = " " * ((_BYTES_PER_ROW - len(chunk)) * 3)
+            print(f"{highlight}{label(addrb + offset)} {chunk.hex(' ').upper()} {reset}{padding}{ascvisual}")
+
+        sys.stdout.flush()
 
     def write_to_vdisk(self, memory: Memory, disk: Disk, address: int, firstsector: int, number: int) -> None:
         """
@@ -1254,9 +1751,12 @@ class CpuX8086():
         Returns:
             None.
         """
-        for i in range(0, number - 1):
-            print("Writing to vdisk...", firstsector + i, memory.peek(address + i))
-            disk.write(firstsector+i, memory.peek(address + i))
+        block = memory.view(memory.active_page)[address:address + number].tobytes()
+        if len(block) != number:
+            self.terminal.error_message("Invalid value.")
+            return
+
+        disk.write_block(firstsector, block)
 
     def read_from_vdisk(self, memory: Memory, disk: Disk, address: int, firstsector: int, number: int) -> None:
         """
@@ -1272,6 +1772,7 @@ class CpuX8086():
         Returns:
             None.
         """
-        for i in range(0, number - 1):
-            memory.poke(memory.active_page, address, disk.read(firstsector + i))
+        block = disk.read_block(firstsector, number)
+        if block:
+            memory.poke_block(memory.active_page, address, block)
 
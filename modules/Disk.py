@@ -19,7 +19,7 @@ class Disk:
         """
         self._filename = os.path.join(os.path.expanduser("~"), "." + filename)
         self._size = size
-        self._disk = [0b00000000] * self._size
+        self._disk = bytearray(self._size)
         self._terminal = Terminal()
         
     def get_size(self) -> int:
@@ -78,6 +78,25 @@ class Disk:
             self._disk[int(sector)] = value
             return True
 
+    def write_block(self, sector: int, data: bytes) -> bool:
+        """Write consecutive bytes to the virtual disk.
+
+        Args:
+            sector:  First sector where the bytes are written.
+            data: The bytes to be written.
+
+        Returns:
+            bool: True if successful, False if not.
+
+        """
+
+        if sector < 0 or sector + len(data) > self._size:
+            self._terminal.error_message("Disk.write_block(): Invalid sector.")
+            return False
+        else:
+            self._disk[sector:sector + len(data)] = data
+            return True
+
     def read(self, sector: int) -> int:
         """Read a virtual disk sector.
 
@@ -93,6 +112,22 @@ class Disk:
         else:
             return self._disk[int(sector)]
 
+    def read_block(self, sector: int, number: int) -> bytes:
+        """Read consecutive virtual disk sectors.
+
+        Parameters:
+            sector (int): First sector to be read.
+            number (int): Number of sectors to be read.
+
+        Returns:
+            bytes: the read bytes, or empty if there were any problem.
+        """
+        if sector < 0 or number < 0 or sector + number > self._size:
+            self._terminal.error_message("Disk.read_block(): Invalid sector.")
+            return b""
+        else:
+            return bytes(self._disk[sector:sector + number])
+
     def load(self) -> bool:
         """Load the virtual disk from a real file.
 
@@ -106,8 +141,8 @@ class Disk:
             self._terminal.error_message(f"Disk.load(): Problem accessing {self._filename}")
             return False
 
-        for i, value in enumerate(content):
-            self._disk[i] = value
+        content = content[:self._size]
+        self._disk[:len(content)] = content
         return True
 
 
@@ -20,7 +20,7 @@ class Memory:
         self.offset_cursor = 0
         self.active_page = 1  # Like the old C000
         self._offsets = 65536  # 64K per page
-        self._memory = [[0b00000000] * self._offsets for _ in range(self.pages)]
+        self._memory = [bytearray(self._offsets) for _ in range(self.pages)]  # One zeroed bytearray per page
         self.terminal = Terminal()
 
     def __str__(self) -> str:
@@ -74,11 +74,10 @@ class Memory:
         Returns:
             int: Pointed address value.
         """
-        try:
-            return self.peek(int(page, 16), int(address, 16))
-        except ValueError:
-            self.terminal.warning_message("Memory.peek(): Invalid hexadecimal address or page.")
+        if not (0 <= page < len(self._memory)) or not (0 <= address < self._offsets):
+            self.terminal.warning_message(f"Memory.peek(): Invalid address. {page}/{len(self._memory)}:{address}/{self._offsets}")
             return -1
+        return self._memory[page][address]
     
     @dispatch(str, str)
     def peek(self, page: str, address: str) -> int:
@@ -93,7 +92,27 @@ class Memory:
         Returns:
             int: Pointed address value.
         """
-        return self.peek(int(page, 16), int(address, 16))
+        try:
+            return self.peek(int(page, 16), int(address, 16))
+        except ValueError:
+            self.terminal.warning_message("Memory.peek(): Invalid hexadecimal address or page.")
+            return -1
+
+    def view(self, page: int) -> memoryview:
+        """
+        view(self, page: int) -> memoryview
+        Read-only view of a whole memory page, without copying it.
+
+        Parameters:
+            page (int): Page memory.
+
+        Returns:
+            memoryview: The page content, or an empty view if the page doesn't exist.
+        """
+        if not (0 <= page < len(self._memory)):
+            self.terminal.warning_message(f"Memory.view(): Invalid page. {page}/{len(self._memory)}")
+            return memoryview(b"")
+        return memoryview(self._memory[page]).toreadonly()
 
     @dispatch(int, int, int)
     def poke(self, page: int, address: int, value: int) -> bool:
@@ -113,4 +132,23 @@ class Memory:
             self.terminal.warning_message(f"Memory.poke(): Invalid address or value. {page}/{len(self._memory)}:{address}/{self._offsets}, {value}")
             return False
         self._memory[page][address] = value
+        return True
+
+    def poke_block(self, page: int, address: int, data: bytes) -> bool:
+        """
+        poke_block(self, page: int, address: int, data: bytes) -> bool
+        Write a block of bytes to memory, starting from an address.
+
+        Parameters:
+            page (int): Page memory.
+            address (int): Address where to start writing.
+            data (bytes): Values to set in memory.
+
+        Returns:
+            bool: Operation result.
+        """
+        if not (0 <= page < len(self._memory)) or not (0 <= address <= address + len(data) <= self._offsets):
+            self.terminal.warning_message(f"Memory.poke_block(): Invalid address range. {page}/{len(self._memory)}:{address}+{len(data)}/{self._offsets}")
+            return False
+        self._memory[page][address:address + len(data)] = data
         return True
\ No newline at end of file